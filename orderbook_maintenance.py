@@ -3,6 +3,8 @@
 """
 TankX – Case Study 1: Order Book Maintenance (Parameterized CLI + CSV Export)
 
+Requires: sortedcontainers (pip install -r requirements.txt)
+
 Usage examples:
   # 1) Process full stream and write top-10 to CSV
   python orderbook_maintenance.py \
@@ -28,96 +30,212 @@ Usage examples:
     --out-prefix results/limit_after
 """
 
-from typing import List, Tuple, Dict, Optional
-from dataclasses import dataclass, field
+from typing import List, Tuple, Dict, Iterator, Optional
+from array import array
+from concurrent.futures import ProcessPoolExecutor
+from itertools import accumulate, chain, islice
+from operator import mul
 import csv
 import ast
-import bisect
+import mmap
+import re
 import time
 import argparse
 import os
+import sys
+
+from sortedcontainers import SortedDict
 
 
 # -----------------------------
 # Order Book Implementation
 # -----------------------------
 
-@dataclass
+# tolerance, in ticks, for a price to count as on the tick grid
+TICK_EPS = 1e-6
+
+
 class SideBook:
-    """Maintains one side (bids or asks) of the order book."""
-    is_ask: bool
-    prices: List[float] = field(default_factory=list)
-    qty: Dict[float, float] = field(default_factory=dict)
-
-    def _key_index(self, price: float) -> int:
-        """Return insertion index obeying side ordering (asks↑, bids↓)."""
-        if self.is_ask:
-            return bisect.bisect_left(self.prices, price)
-        # bids: descending; emulate bisect via negatives
-        negs = [-p for p in self.prices]
-        return bisect.bisect_left(negs, -price)
+    """
+    Maintains one side (bids or asks) of the order book.
+
+    Levels are kept in a SortedDict whose iteration order is best-first:
+    asks are keyed by price, bids by negated price. With a `tick` size the
+    key is the price in integer ticks instead of the raw float; every stored
+    price must then lie on that grid (off-grid prices raise ValueError rather
+    than being merged into a neighbouring level). `_cum` caches the running
+    sum of key*qty in that order (unboxed doubles) and `_top` the last best_n
+    result; both are dropped on every update.
+    """
+    __slots__ = ("is_ask", "tick", "levels", "_inv_tick", "_cum", "_top")
+
+    def __init__(self, is_ask: bool, tick: Optional[float] = None) -> None:
+        self.is_ask = is_ask
+        self.tick = tick
+        self.levels = SortedDict()
+        self._inv_tick: Optional[float] = None
+        self._cum: Optional[array] = None
+        self._top: Optional[List[Tuple[float, float]]] = None
+        if tick is not None:
+            if tick <= 0:
+                raise ValueError("tick must be positive")
+            self._inv_tick = 1.0 / tick
+
+    def _key(self, price: float) -> float:
+        """Map a price to its sort key (asks↑, bids↓); off-grid prices raise."""
+        if self._inv_tick is not None:
+            x = price * self._inv_tick
+            k = round(x)
+            if abs(x - k) > TICK_EPS:
+                raise ValueError(f"price {price!r} is not on the {self.tick!r} tick grid")
+            return k if self.is_ask else -k
+        return price if self.is_ask else -price
+
+    def _bound(self, price: float) -> float:
+        """Key-space bound for 'at or better than price'; any price allowed."""
+        if self._inv_tick is not None:
+            x = price * self._inv_tick
+            k = round(x)
+            if abs(x - k) <= TICK_EPS:
+                x = k
+            return x if self.is_ask else -x
+        return price if self.is_ask else -price
+
+    def _price(self, key: float) -> float:
+        """Inverse of _key; linear, so it also maps sums of key*qty."""
+        p = key if self.is_ask else -key
+        return p if self._inv_tick is None else p / self._inv_tick
+
+    def qty_at(self, price: float) -> float:
+        """Aggregate quantity resting at price (0.0 if no level)."""
+        return self.levels.get(self._key(price), 0.0)
 
     def update_level(self, price: float, new_qty: float) -> None:
         """Set aggregate quantity at price; remove level if new_qty <= 0."""
+        k = self._key(price)
+        self._cum = self._top = None
         if new_qty <= 0:
-            if price in self.qty:
-                idx = self.prices.index(price)
-                self.prices.pop(idx)
-                self.qty.pop(price, None)
-            return
-        if price in self.qty:
-            self.qty[price] = new_qty
+            self.levels.pop(k, None)
         else:
-            idx = self._key_index(price)
-            self.prices.insert(idx, price)
-            self.qty[price] = new_qty
+            self.levels[k] = new_qty
+
+    def keyed(self, updates: List[Tuple[float, float]]) -> List[Tuple[float, float]]:
+        """
+        Map (price, qty) pairs to (key, qty) without touching the book, so an
+        off-grid price raises before any level of the batch is applied.
+        """
+        inv = self._inv_tick
+        if inv is None:
+            return updates if self.is_ask else [(-p, q) for p, q in updates]
+        sign = 1 if self.is_ask else -1
+        out = []
+        for price, new_qty in updates:
+            x = price * inv
+            k = round(x)
+            if abs(x - k) > TICK_EPS:
+                raise ValueError(f"price {price!r} is not on the {self.tick!r} tick grid")
+            out.append((sign * k, new_qty))
+        return out
+
+    def update_keyed(self, updates: List[Tuple[float, float]]) -> None:
+        """Apply (key, qty) pairs from keyed(); qty <= 0 removes the level."""
+        levels = self.levels
+        pop = levels.pop
+        self._cum = self._top = None
+        for k, new_qty in updates:
+            if new_qty <= 0:
+                pop(k, None)
+            else:
+                levels[k] = new_qty
+
+    def update_levels(self, updates: List[Tuple[float, float]]) -> None:
+        """Batch form of update_level for a parsed list of (price, qty) pairs."""
+        self.update_keyed(self.keyed(updates))
+
+    def consume(self, price: float, qty: float) -> float:
+        """
+        Fill up to qty against levels at or better than price, best first, and
+        return the unfilled remainder. Fully taken levels (and any float dust
+        <= 1e-15 left on the last one) are removed with a single slice delete.
+        """
+        levels = self.levels
+        # crossable levels are a key-space prefix, so no per-level price compare
+        n_cross = levels.bisect_right(self._bound(price))
+        if n_cross == 0 or qty <= 1e-15:
+            return qty
+        n_done = 0
+        partial = None
+        for k in islice(levels, n_cross):
+            level_q = levels[k]
+            if level_q < qty:
+                qty -= level_q
+                n_done += 1
+                if qty <= 1e-15:
+                    break
+            else:
+                rest = level_q - qty
+                qty = 0.0
+                if rest > 1e-15:
+                    partial = (k, rest)
+                else:
+                    n_done += 1
+                break
+        self._cum = self._top = None
+        if n_done:
+            del levels.keys()[:n_done]
+        if partial is not None:
+            levels[partial[0]] = partial[1]
+        return qty
 
     def notional_ahead(self, price: float) -> float:
         """
         Sum(price_i * qty_i) for all levels better-or-equal than `price`.
         For asks: better means lower-or-equal; for bids: higher-or-equal.
         """
-        if not self.prices:
+        idx = self.levels.bisect_right(self._bound(price))
+        if idx == 0:
             return 0.0
-        total = 0.0
-        if self.is_ask:  # ascending
-            idx = bisect.bisect_right(self.prices, price) - 1
-            if idx < 0:
-                return 0.0
-            for p in self.prices[: idx + 1]:
-                total += p * self.qty.get(p, 0.0)
-        else:  # descending
-            for p in self.prices:
-                if p >= price:
-                    total += p * self.qty.get(p, 0.0)
-                else:
-                    break
-        return total
+        if self._cum is None:
+            # key*qty products and their running sum stay in C (map/accumulate)
+            levels = self.levels
+            self._cum = array("d", accumulate(map(mul, levels, map(levels.__getitem__, levels))))
+        return self._price(self._cum[idx - 1])
 
     def best_n(self, n: int) -> List[Tuple[float, float]]:
         """Return top-n levels as (price, quantity)."""
-        return [(p, self.qty[p]) for p in self.prices[:n]]
+        top = self._top
+        if top is None or (len(top) < n and len(top) < len(self.levels)):
+            levels = self.levels
+            keys = list(islice(levels, n))
+            prices = keys if self.is_ask and self._inv_tick is None else map(self._price, keys)
+            top = list(zip(prices, map(levels.__getitem__, keys)))
+            self._top = top
+        return top[:n]
 
 
 class OrderBook:
     """Full order book: bids + asks; applies snapshot/diff; queries and sims."""
-    def __init__(self) -> None:
-        self.bids = SideBook(is_ask=False)
-        self.asks = SideBook(is_ask=True)
-
-    def apply_snapshot(self, bids: List[List[float]], asks: List[List[float]]) -> None:
-        self.bids = SideBook(is_ask=False)
-        self.asks = SideBook(is_ask=True)
-        for price, qty in bids:
-            self.bids.update_level(float(price), float(qty))
-        for price, qty in asks:
-            self.asks.update_level(float(price), float(qty))
-
-    def apply_diff(self, bids: List[List[float]], asks: List[List[float]]) -> None:
-        for price, qty in bids:
-            self.bids.update_level(float(price), float(qty))
-        for price, qty in asks:
-            self.asks.update_level(float(price), float(qty))
+    __slots__ = ("tick", "bids", "asks")
+
+    def __init__(self, tick: Optional[float] = None) -> None:
+        self.tick = tick
+        self.bids = SideBook(is_ask=False, tick=tick)
+        self.asks = SideBook(is_ask=True, tick=tick)
+
+    def apply_snapshot(self, bids: List[Tuple[float, float]], asks: List[Tuple[float, float]]) -> None:
+        # built aside and swapped in only once both sides are valid
+        new_bids = SideBook(is_ask=False, tick=self.tick)
+        new_asks = SideBook(is_ask=True, tick=self.tick)
+        new_bids.update_levels(bids)
+        new_asks.update_levels(asks)
+        self.bids, self.asks = new_bids, new_asks
+
+    def apply_diff(self, bids: List[Tuple[float, float]], asks: List[Tuple[float, float]]) -> None:
+        # key both sides first: a bad price must not leave the diff half-applied
+        bid_keys = self.bids.keyed(bids)
+        ask_keys = self.asks.keyed(asks)
+        self.bids.update_keyed(bid_keys)
+        self.asks.update_keyed(ask_keys)
 
     def notional_ahead(self, side: str, price: float) -> float:
         s = side.lower()
@@ -139,81 +257,201 @@ class OrderBook:
             return self.top10()
 
         if s in ("buy", "bid"):
-            while self.asks.prices and self.asks.prices[0] <= price and qty > 1e-15:
-                p = self.asks.prices[0]
-                level_q = self.asks.qty[p]
-                take = min(level_q, qty)
-                self.asks.update_level(p, level_q - take)
-                if p in self.asks.qty and self.asks.qty[p] <= 1e-15:
-                    self.asks.update_level(p, 0.0)
-                qty -= take
-            if qty > 1e-15:
-                existing = self.bids.qty.get(price, 0.0)
-                self.bids.update_level(price, existing + qty)
-
+            own, other = self.bids, self.asks
         elif s in ("sell", "ask"):
-            while self.bids.prices and self.bids.prices[0] >= price and qty > 1e-15:
-                p = self.bids.prices[0]
-                level_q = self.bids.qty[p]
-                take = min(level_q, qty)
-                self.bids.update_level(p, level_q - take)
-                if p in self.bids.qty and self.bids.qty[p] <= 1e-15:
-                    self.bids.update_level(p, 0.0)
-                qty -= take
-            if qty > 1e-15:
-                existing = self.asks.qty.get(price, 0.0)
-                self.asks.update_level(price, existing + qty)
+            own, other = self.asks, self.bids
         else:
             raise ValueError("side must be buy/bid or sell/ask")
 
+        own._key(price)  # an off-grid limit price raises before anything fills
+        qty = other.consume(price, qty)
+        if qty > 1e-15:
+            own.update_level(price, own.qty_at(price) + qty)
+
         return self.top10()
 
     def top10(self):
         return {"bids": self.bids.best_n(10), "asks": self.asks.best_n(10)}
 
 
+# "[[p, q], [p, q], ...]" where each value is a plain number literal or a quoted
+# string without commas/brackets; the only shape _parse may flatten
+_NUM = r"[-+]?(?:\d+(?:\.\d*)?|\.\d+)(?:[eE][-+]?\d+)?"
+_VAL = r"""\s*(?:%s|'[^'"\\\[\],]*'|"[^'"\\\[\],]*")\s*""" % _NUM
+_LEVEL = r"\[%s,%s\]" % (_VAL, _VAL)
+_CELL_RE = re.compile(r"\[\s*%s(?:\s*,\s*%s)*\s*\]" % (_LEVEL, _LEVEL))
+
+
 class OrderBookEngine:
     """Streams a CSV and maintains per-symbol order books."""
-    def __init__(self, path: str) -> None:
+    def __init__(self, path: str, tick: Optional[float] = None) -> None:
         self.path = path
+        self.tick = tick
         self.books: Dict[str, OrderBook] = {}
 
     def _book(self, symbol: str) -> OrderBook:
         if symbol not in self.books:
-            self.books[symbol] = OrderBook()
+            self.books[symbol] = OrderBook(tick=self.tick)
         return self.books[symbol]
 
     @staticmethod
-    def _parse(cell: str) -> List[List[float]]:
+    def _parse(cell: str) -> List[Tuple[float, float]]:
+        """
+        Parse "[[price, qty], ...]" into (price, qty) pairs.
+
+        A cell whose shape _CELL_RE confirms (pairs of number literals or quoted
+        strings) is flattened to a comma-separated run of values and re-zipped,
+        which is far cheaper than building an AST per row. Anything else falls
+        back to ast.literal_eval, so malformed cells raise as before.
+        """
         if not cell or cell == "[]":
             return []
-        data = ast.literal_eval(cell)  # safe literal parse
-        return [[float(p), float(q)] for p, q in data]
+        if _CELL_RE.fullmatch(cell) is None:
+            data = ast.literal_eval(cell)  # safe literal parse
+            return [(float(p), float(q)) for p, q in data]
+        flat = cell.replace("[", "").replace("]", "")
+        if "'" in flat or '"' in flat:
+            flat = flat.replace("'", "").replace('"', "")
+        it = iter(map(float, flat.split(",")))
+        return list(zip(it, it))
+
+    @staticmethod
+    def _columns(header: List[str]) -> Tuple[int, int, int, int]:
+        """Indices of the symbol, time, bids and asks columns."""
+        return (header.index("symbol"), header.index("time"),
+                header.index("bids"), header.index("asks"))
+
+    def _symbol_rows(self, symbol: str) -> Iterator[Tuple[float, str, str]]:
+        """
+        Yield (time, bids, asks) cells for `symbol` in file order.
+
+        The file is memory-mapped and each line is first checked for the
+        symbol bytes (at the symbol column's offset when that is safe to
+        find); only candidate lines are decoded and handed to the csv
+        module, which makes the exact symbol comparison. If a candidate line
+        has an unbalanced quote (a quoted cell spanning lines) the rest of the
+        stream comes from the plain csv.reader path instead.
+        """
+        split_record = False
+        n_yielded = 0
+        with open(self.path, "rb") as f:
+            if os.fstat(f.fileno()).st_size == 0:
+                return
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                size = mm.size()
+                pos = mm.find(b"\n")
+                pos = size if pos == -1 else pos + 1
+                header = next(csv.reader([mm[:pos].decode("utf-8")]))
+                i_sym, i_ts, i_bids, i_asks = self._columns(header)
+                # bare symbol bytes: also matches a quoted field or the last column
+                needle = symbol.encode("utf-8")
+                if b'"' in needle:
+                    needle = b""  # csv would escape it; let every line through
+                n = len(needle)
+                # Columns before the symbol are normally plain (time): the
+                # symbol field can then be matched at its own offset, so a
+                # non-matching row never scans its bids/asks payload.
+                at_offset = n > 0 and i_sym < i_bids and i_sym < i_asks
+
+                def is_candidate(pos: int, end: int) -> bool:
+                    find = mm.find
+                    if at_offset:
+                        start = pos
+                        for _ in range(i_sym):
+                            start = find(b",", start, end) + 1
+                            if not start:
+                                break
+                        # raw comma counting is only sound with no quoting before the field
+                        if start and find(b'"', pos, start) == -1:
+                            if find(b'"', start, start + 1) == start:
+                                start += 1
+                            return find(needle, start, start + n) == start
+                    return find(needle, pos, end) != -1
+
+                def candidate_lines(pos: int) -> Iterator[str]:
+                    nonlocal split_record
+                    find = mm.find
+                    while pos < size:
+                        end = find(b"\n", pos)
+                        if end == -1:
+                            end = size
+                        if is_candidate(pos, end):
+                            line = mm[pos:end]
+                            if line.count(b'"') % 2:
+                                split_record = True
+                                return
+                            yield line.decode("utf-8")
+                        pos = end + 1
+
+                # one reader splits every candidate line instead of one per row
+                for row in csv.reader(candidate_lines(pos)):
+                    if len(row) > i_sym and row[i_sym] == symbol:
+                        n_yielded += 1
+                        yield float(row[i_ts]), row[i_bids], row[i_asks]
+        if split_record:
+            yield from self._symbol_rows_csv(symbol, skip=n_yielded)
+
+    def _symbol_rows_csv(self, symbol: str, skip: int = 0) -> Iterator[Tuple[float, str, str]]:
+        """csv.reader-only form of _symbol_rows, skipping the first `skip` matches."""
+        with open(self.path, "r", newline="", encoding="utf-8") as f:
+            reader = csv.reader(f)
+            header = next(reader, None)
+            if header is None:
+                return
+            i_sym, i_ts, i_bids, i_asks = self._columns(header)
+            for row in reader:
+                if len(row) <= i_sym or row[i_sym] != symbol:
+                    continue
+                if skip:
+                    skip -= 1
+                    continue
+                yield float(row[i_ts]), row[i_bids], row[i_asks]
 
     def build_until(self, symbol: str, until_ts: float):
         book = self._book(symbol)
         seen = False
-        with open(self.path, "r", newline="") as f:
-            reader = csv.DictReader(f)
-            for row in reader:
-                if row["symbol"] != symbol:
-                    continue
-                ts = float(row["time"])
-                bids = self._parse(row["bids"])
-                asks = self._parse(row["asks"])
-                if not seen:
-                    book.apply_snapshot(bids, asks)
-                    seen = True
-                else:
-                    book.apply_diff(bids, asks)
-                if ts >= until_ts:
-                    break
+        for ts, bids_cell, asks_cell in self._symbol_rows(symbol):
+            bids = self._parse(bids_cell)
+            asks = self._parse(asks_cell)
+            if not seen:
+                book.apply_snapshot(bids, asks)
+                seen = True
+            else:
+                book.apply_diff(bids, asks)
+            if ts >= until_ts:
+                break
         return book.top10()
 
+    def build_until_many(self, symbols: List[str], until_ts: float,
+                         max_workers: Optional[int] = None):
+        """
+        build_until for several symbols, one worker process per symbol.
+
+        Books are independent, so each worker streams the file for its own
+        symbol (the byte-level pre-filter skips everything else) and sends
+        the finished OrderBook back. Returns {symbol: top10}.
+        """
+        symbols = list(dict.fromkeys(symbols))
+        if len(symbols) <= 1:
+            return {s: self.build_until(s, until_ts) for s in symbols}
+        workers = max_workers or min(len(symbols), os.cpu_count() or 1)
+        with ProcessPoolExecutor(max_workers=workers) as ex:
+            futures = {s: ex.submit(_build_book, self.path, self.tick, s, until_ts) for s in symbols}
+            for s, fut in futures.items():
+                self.books[s] = fut.result()
+        return {s: self.books[s].top10() for s in symbols}
+
     def expose(self, symbol: str) -> Optional[OrderBook]:
         return self.books.get(symbol, None)
 
 
+def _build_book(path: str, tick: Optional[float], symbol: str, until_ts: float) -> OrderBook:
+    """Process-pool worker for OrderBookEngine.build_until_many."""
+    engine = OrderBookEngine(path, tick=tick)
+    engine.build_until(symbol, until_ts)
+    return engine.books[symbol]
+
+
 # -----------------------------
 # CSV Export Helpers
 # -----------------------------
@@ -224,11 +462,15 @@ def ensure_dir_for(prefix: str) -> None:
         os.makedirs(d, exist_ok=True)
 
 def write_levels_csv(path: str, rows: List[Tuple[float, float]]) -> None:
+    # built as one string and written once; numeric fields never need csv quoting
+    body = "".join([f"{p:.10f},{q:.10f}\r\n" for p, q in rows])
     with open(path, "w", newline="") as f:
-        w = csv.writer(f)
-        w.writerow(["price", "quantity"])
-        for p, q in rows:
-            w.writerow([f"{p:.10f}", f"{q:.10f}"])
+        f.write("price,quantity\r\n" + body)
+
+def write_levels_bin(path: str, rows: List[Tuple[float, float]]) -> None:
+    """Raw native-endian float64 pairs (price, quantity), no header."""
+    with open(path, "wb") as f:
+        array("d", chain.from_iterable(rows)).tofile(f)
 
 def write_summary_csv(path: str, summary: Dict[str, str]) -> None:
     with open(path, "w", newline="") as f:
@@ -247,12 +489,18 @@ def main():
     ap.add_argument("--file", required=True, help="Path to orderbook CSV (orderbooks-10.csv or orderbooks-1000.csv)")
     ap.add_argument("--symbol", required=True, help="Symbol to process, e.g., BTC/USD")
     ap.add_argument("--until", type=float, required=True, help="Timestamp (inclusive) to process up to")
+    ap.add_argument("--tick", type=float, default=None,
+                    help="Price tick size (e.g., 0.01); levels are then keyed by integer ticks "
+                         "and every book/limit price must lie on that grid")
 
-    ap.add_argument("--out-prefix", required=True, help="Output prefix for CSV files, e.g., results/run1")
+    ap.add_argument("--out-prefix", required=True, help="Output prefix for result files, e.g., results/run1")
     ap.add_argument("--notional-ahead", nargs=2, metavar=("SIDE", "PRICE"),
                     help="Compute notional ahead for side at price (e.g., bid 112300) and add to summary")
     ap.add_argument("--place-limit", nargs=3, metavar=("SIDE", "PRICE", "QTY"),
                     help="Simulate a limit order and export the new top-10")
+    ap.add_argument("--binary", action="store_true",
+                    help="Write level files as .bin instead of CSV: raw float64 (price, quantity) "
+                         "pairs in this machine's native byte order, no header")
 
     args = ap.parse_args()
 
@@ -260,15 +508,21 @@ def main():
 
     # 1) Build the book
     t0 = time.time()
-    engine = OrderBookEngine(args.file)
+    engine = OrderBookEngine(args.file, tick=args.tick)
     top10 = engine.build_until(args.symbol, args.until)
     elapsed = time.time() - t0
 
     # 2) Export top-10
-    bids_path = f"{args.out_prefix}_top10_bids.csv"
-    asks_path = f"{args.out_prefix}_top10_asks.csv"
-    write_levels_csv(bids_path, top10["bids"])
-    write_levels_csv(asks_path, top10["asks"])
+    if args.binary:
+        fmt, write_levels = "bin", write_levels_bin
+        levels_format = f"bin: float64 (price, quantity) pairs, {sys.byteorder}-endian, no header"
+    else:
+        fmt, write_levels = "csv", write_levels_csv
+        levels_format = None
+    bids_path = f"{args.out_prefix}_top10_bids.{fmt}"
+    asks_path = f"{args.out_prefix}_top10_asks.{fmt}"
+    write_levels(bids_path, top10["bids"])
+    write_levels(asks_path, top10["asks"])
 
     # 3) Optional: NotionalAhead
     notional_value = None
@@ -289,10 +543,10 @@ def main():
         if not ob:
             raise RuntimeError("OrderBook not found after build_until.")
         after = ob.place_limit_order(side, price, qty)
-        after_bids_path = f"{args.out_prefix}_after_place_limit_bids.csv"
-        after_asks_path = f"{args.out_prefix}_after_place_limit_asks.csv"
-        write_levels_csv(after_bids_path, after["bids"])
-        write_levels_csv(after_asks_path, after["asks"])
+        after_bids_path = f"{args.out_prefix}_after_place_limit_bids.{fmt}"
+        after_asks_path = f"{args.out_prefix}_after_place_limit_asks.{fmt}"
+        write_levels(after_bids_path, after["bids"])
+        write_levels(after_asks_path, after["asks"])
 
     # 5) Summary CSV
     summary = {
@@ -300,17 +554,19 @@ def main():
         "symbol": args.symbol,
         "until": str(args.until),
         "process_seconds": f"{elapsed:.6f}",
-        "top10_bids_csv": bids_path,
-        "top10_asks_csv": asks_path,
+        f"top10_bids_{fmt}": bids_path,
+        f"top10_asks_{fmt}": asks_path,
     }
+    if levels_format is not None:
+        summary["levels_format"] = levels_format
     if notional_value is not None:
         summary["notional_ahead"] = f"{notional_value:.10f}"
         summary["notional_side"] = args.notional_ahead[0]
         summary["notional_price"] = args.notional_ahead[1]
     if after_bids_path:
-        summary["after_place_limit_bids_csv"] = after_bids_path
+        summary[f"after_place_limit_bids_{fmt}"] = after_bids_path
     if after_asks_path:
-        summary["after_place_limit_asks_csv"] = after_asks_path
+        summary[f"after_place_limit_asks_{fmt}"] = after_asks_path
     write_summary_csv(f"{args.out_prefix}_summary.csv", summary)
 
     # Console info
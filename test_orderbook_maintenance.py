@@ -0,0 +1,389 @@
+"""
+Regression tests for orderbook_maintenance.
+
+The fast paths are checked against straightforward reference versions of
+the original code: ast.literal_eval for the cell parser, csv.DictReader for
+the symbol row scan and the level-by-level crossing loop for SideBook.consume.
+
+Run with:  python -m unittest test_orderbook_maintenance
+"""
+
+import ast
+import csv
+import os
+import random
+import subprocess
+import sys
+import tempfile
+import unittest
+from array import array
+
+from orderbook_maintenance import OrderBook, OrderBookEngine, SideBook, write_levels_bin, write_levels_csv
+
+
+# -----------------------------
+# Reference implementations
+# -----------------------------
+
+def ref_parse(cell):
+    if not cell or cell == "[]":
+        return []
+    return [(float(p), float(q)) for p, q in ast.literal_eval(cell)]
+
+
+def ref_write_levels_csv(path, rows):
+    with open(path, "w", newline="") as f:
+        w = csv.writer(f)
+        w.writerow(["price", "quantity"])
+        for p, q in rows:
+            w.writerow([f"{p:.10f}", f"{q:.10f}"])
+
+
+def ref_rows(path, symbol):
+    with open(path, "r", newline="") as f:
+        return [(float(r["time"]), r["bids"], r["asks"])
+                for r in csv.DictReader(f) if r["symbol"] == symbol]
+
+
+class RefBook:
+    """Plain dict book with the original per-level crossing loop."""
+    def __init__(self, bids, asks):
+        self.bids = {}
+        self.asks = {}
+        for side, levels in ((self.bids, bids), (self.asks, asks)):
+            for p, q in levels:
+                if q <= 0:
+                    side.pop(p, None)
+                else:
+                    side[p] = q
+
+    @staticmethod
+    def _set(side, p, q):
+        if q <= 0:
+            side.pop(p, None)
+        else:
+            side[p] = q
+
+    def place_limit_order(self, s, price, qty):
+        if qty <= 0:
+            return self.top10()
+        if s == "buy":
+            book, own, better = self.asks, self.bids, min
+            crosses = lambda p: p <= price
+        else:
+            book, own, better = self.bids, self.asks, max
+            crosses = lambda p: p >= price
+        while book and qty > 1e-15:
+            p = better(book)
+            if not crosses(p):
+                break
+            level_q = book[p]
+            take = min(level_q, qty)
+            self._set(book, p, level_q - take)
+            if p in book and book[p] <= 1e-15:
+                self._set(book, p, 0.0)
+            qty -= take
+        if qty > 1e-15:
+            self._set(own, price, own.get(price, 0.0) + qty)
+        return self.top10()
+
+    def notional_ahead(self, s, price):
+        if s == "ask":
+            ahead = sorted(p for p in self.asks if p <= price)
+            return sum(p * self.asks[p] for p in ahead)
+        ahead = sorted((p for p in self.bids if p >= price), reverse=True)
+        return sum(p * self.bids[p] for p in ahead)
+
+    def top10(self):
+        return {"bids": [(p, self.bids[p]) for p in sorted(self.bids, reverse=True)[:10]],
+                "asks": [(p, self.asks[p]) for p in sorted(self.asks)[:10]]}
+
+
+# -----------------------------
+# Tests
+# -----------------------------
+
+class ParseTests(unittest.TestCase):
+    CELLS = [
+        "[]",
+        "",
+        "[[112300.5, 0.25]]",
+        "[[1.5, 2], [3e2, 0.0], [-1, 7]]",
+        "[[1,2],[3,4]]",
+        "[[1,2],]",
+        "[['1.5', '2'], ['3', '4.25']]",
+        "[[100.0, 1.0],\n [99.0, 2.0]]",
+    ]
+
+    def test_matches_literal_eval(self):
+        for cell in self.CELLS:
+            with self.subTest(cell=cell):
+                self.assertEqual(OrderBookEngine._parse(cell), ref_parse(cell))
+
+    def test_malformed_shapes_raise(self):
+        cells = (
+            "[[100,1,5],[99,2,6]]",
+            "[[1,2],[3]]",
+            "[[1,2,3,4]]",
+            "[[100,1,5],[99]]",   # right total count, wrong per-level shape
+            "[[1],[2,3,4]]",
+            "[[1,2],[3,4]]]",     # unbalanced
+            "[['1.5, 2']]",       # one string, not a pair
+            "[[inf, 1]]",         # bare name, not a literal
+        )
+        for cell in cells:
+            with self.subTest(cell=cell):
+                with self.assertRaises((ValueError, SyntaxError)):
+                    OrderBookEngine._parse(cell)
+
+
+class SymbolRowsTests(unittest.TestCase):
+    ROWS = [
+        ("1", "BTC/USD", "[[100.0, 1.0]]", "[[101.0, 2.0]]"),
+        ("2", "BTC/USDT", "[[50.0, 1.0]]", "[]"),
+        ("3", "ETH/USD", "[[10.0, 3.0]]", "[[11.0, 1.0]]"),
+        ("4", "BTC/USD", "[[100.0, 0.0], [99.5, 4.0]]", "[]"),
+    ]
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+
+    def _write(self, header, rows, **fmt):
+        path = os.path.join(self.tmp.name, f"ob{len(os.listdir(self.tmp.name))}.csv")
+        with open(path, "w", newline="") as f:
+            w = csv.writer(f, **fmt)
+            w.writerow(header)
+            w.writerows(rows)
+        return path
+
+    def _check(self, path, symbols=("BTC/USD", "BTC/USDT", "ETH/USD")):
+        engine = OrderBookEngine(path)
+        for sym in symbols:
+            with self.subTest(path=os.path.basename(path), symbol=sym):
+                self.assertEqual(list(engine._symbol_rows(sym)), ref_rows(path, sym))
+
+    def test_time_symbol_layout(self):
+        self._check(self._write(["time", "symbol", "bids", "asks"], self.ROWS))
+
+    def test_quote_all(self):
+        self._check(self._write(["time", "symbol", "bids", "asks"], self.ROWS,
+                                quoting=csv.QUOTE_ALL))
+
+    def test_crlf(self):
+        self._check(self._write(["time", "symbol", "bids", "asks"], self.ROWS,
+                                lineterminator="\r\n"))
+
+    def test_symbol_first_and_last(self):
+        self._check(self._write(["symbol", "time", "bids", "asks"],
+                                [(s, t, b, a) for t, s, b, a in self.ROWS]))
+        self._check(self._write(["time", "bids", "asks", "symbol"],
+                                [(t, b, a, s) for t, s, b, a in self.ROWS]))
+
+    def test_quoted_comma_before_symbol(self):
+        # quoting ahead of the symbol column rules out the raw comma-count offset
+        venues = ["a,b", "x", "\"q\"", "y"]
+        rows = [(v, s, t, b, a) for v, (t, s, b, a) in zip(venues, self.ROWS)]
+        self._check(self._write(["venue", "symbol", "time", "bids", "asks"], rows))
+
+    def test_quoted_newline_in_cell(self):
+        rows = list(self.ROWS) + [("5", "BTC/USD", "[[98.0, 1.0],\n [97.0, 2.0]]", "[]"),
+                                  ("6", "BTC/USD", "[[96.0, 1.0]]", "[]")]
+        path = self._write(["time", "symbol", "bids", "asks"], rows)
+        self._check(path)
+        book = OrderBookEngine(path).build_until("BTC/USD", 1e20)
+        self.assertEqual(book["bids"], [(99.5, 4.0), (98.0, 1.0), (97.0, 2.0), (96.0, 1.0)])
+
+    def test_blank_lines(self):
+        # a blank line plus a multi-line cell sends the scan to the csv.reader fallback
+        rows = [self.ROWS[0], (), self.ROWS[1],
+                ("5", "BTC/USD", "[[98.0, 1.0],\n [97.0, 2.0]]", "[]"), (), self.ROWS[3]]
+        path = self._write(["time", "symbol", "bids", "asks"], rows)
+        self._check(path)
+        book = OrderBookEngine(path).build_until("BTC/USD", 1e20)
+        self.assertEqual(book["bids"], [(99.5, 4.0), (98.0, 1.0), (97.0, 2.0)])
+
+    def test_empty_and_header_only(self):
+        path = os.path.join(self.tmp.name, "empty.csv")
+        open(path, "w").close()
+        self.assertEqual(list(OrderBookEngine(path)._symbol_rows("BTC/USD")), [])
+        self._check(self._write(["time", "symbol", "bids", "asks"], []))
+
+
+class BuildUntilManyTests(unittest.TestCase):
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.path = os.path.join(tmp.name, "ob.csv")
+        with open(self.path, "w", newline="") as f:
+            w = csv.writer(f)
+            w.writerow(["time", "symbol", "bids", "asks"])
+            w.writerows(SymbolRowsTests.ROWS)
+            w.writerow(("5", "ETH/USD", "[[10.5, 1.0]]", "[[11.0, 0.0]]"))
+
+    def test_matches_build_until(self):
+        symbols = ["BTC/USD", "ETH/USD", "BTC/USDT"]
+        engine = OrderBookEngine(self.path)
+        result = engine.build_until_many(symbols + ["ETH/USD"], 1e20, max_workers=2)
+        self.assertEqual(list(result), symbols)  # deduplicated, order kept
+        self.assertEqual(sorted(engine.books), sorted(symbols))
+        for sym in symbols:
+            with self.subTest(symbol=sym):
+                expected = OrderBookEngine(self.path).build_until(sym, 1e20)
+                self.assertEqual(result[sym], expected)
+                self.assertEqual(engine.expose(sym).top10(), expected)
+        self.assertEqual(engine.expose("ETH/USD").notional_ahead("bid", 10.0), 10.5 + 30.0)
+
+    def test_single_symbol_runs_inline(self):
+        engine = OrderBookEngine(self.path)
+        result = engine.build_until_many(["BTC/USD", "BTC/USD"], 1e20)
+        self.assertEqual(result, {"BTC/USD": OrderBookEngine(self.path).build_until("BTC/USD", 1e20)})
+        self.assertEqual(list(engine.books), ["BTC/USD"])
+
+
+class PlaceLimitOrderTests(unittest.TestCase):
+    def _random_levels(self, rng, lo, hi):
+        return [(round(rng.uniform(lo, hi), 1), rng.choice([round(rng.random(), 3), 0.1, 0.2, 0.3]))
+                for _ in range(rng.randint(0, 40))]
+
+    def test_matches_reference_loop(self):
+        rng = random.Random(3)
+        for trial in range(1000):
+            bids = self._random_levels(rng, 90, 101)
+            asks = self._random_levels(rng, 99, 110)
+            tick = rng.choice([None, 0.1])
+            side = rng.choice(["buy", "sell"])
+            price = round(rng.uniform(85, 115), 1)
+            qty = rng.choice([rng.random() * 10, 0.3, 0.6, 1e-16])
+            with self.subTest(trial=trial, tick=tick):
+                book = OrderBook(tick)
+                book.apply_snapshot(bids, asks)
+                ref = RefBook(bids, asks)
+                for s in ("bid", "ask"):
+                    self.assertAlmostEqual(book.notional_ahead(s, price),
+                                           ref.notional_ahead(s, price), places=6)
+                self.assertEqual(book.place_limit_order(side, price, qty),
+                                 ref.place_limit_order(side, price, qty))
+                self.assertEqual(book.bids.best_n(1000),
+                                 [(p, ref.bids[p]) for p in sorted(ref.bids, reverse=True)])
+                self.assertEqual(book.asks.best_n(1000),
+                                 [(p, ref.asks[p]) for p in sorted(ref.asks)])
+
+
+class TopCacheTests(unittest.TestCase):
+    def test_best_n_follows_updates(self):
+        side = SideBook(is_ask=False)
+        side.update_levels([(1.0, 1.0), (2.0, 2.0), (3.0, 3.0)])
+        self.assertEqual(side.best_n(2), [(3.0, 3.0), (2.0, 2.0)])
+        side.update_levels([(4.0, 4.0), (3.0, 0.0)])
+        self.assertEqual(side.best_n(2), [(4.0, 4.0), (2.0, 2.0)])
+        side.update_level(5.0, 5.0)
+        self.assertEqual(side.best_n(1), [(5.0, 5.0)])
+        self.assertEqual(side.consume(4.0, 6.0), 0.0)
+        self.assertEqual(side.best_n(2), [(4.0, 3.0), (2.0, 2.0)])
+        self.assertEqual(side.best_n(5), [(4.0, 3.0), (2.0, 2.0), (1.0, 1.0)])
+
+    def test_best_n_returns_a_copy(self):
+        side = SideBook(is_ask=True)
+        side.update_levels([(1.0, 1.0), (2.0, 2.0)])
+        side.best_n(2).clear()
+        self.assertEqual(side.best_n(2), [(1.0, 1.0), (2.0, 2.0)])
+
+
+class TickTests(unittest.TestCase):
+    def _book(self):
+        book = OrderBook(0.01)
+        book.apply_snapshot([(100.0, 2.0)], [(100.05, 1.0)])
+        return book
+
+    def test_off_grid_book_price_raises(self):
+        book = OrderBook(0.01)
+        with self.assertRaises(ValueError):
+            book.apply_snapshot([(100.001, 1.0), (100.004, 2.0)], [])
+
+    def test_off_grid_diff_applies_nothing(self):
+        book = self._book()
+        before = book.top10()
+        with self.assertRaises(ValueError):
+            book.apply_diff([(99.0, 2.0), (98.005, 1.0)], [])
+        with self.assertRaises(ValueError):
+            book.apply_diff([(99.0, 2.0)], [(101.0, 1.0), (101.005, 1.0)])
+        self.assertEqual(book.top10(), before)
+
+    def test_off_grid_snapshot_keeps_old_book(self):
+        book = self._book()
+        before = book.top10()
+        with self.assertRaises(ValueError):
+            book.apply_snapshot([(99.0, 2.0)], [(101.0, 1.0), (101.005, 1.0)])
+        self.assertEqual(book.top10(), before)
+
+    def test_off_grid_limit_raises_before_fill(self):
+        book = self._book()
+        with self.assertRaises(ValueError):
+            book.place_limit_order("buy", 100.055, 5.0)
+        self.assertEqual(book.top10(), {"bids": [(100.0, 2.0)], "asks": [(100.05, 1.0)]})
+
+    def test_off_grid_query_is_a_bound(self):
+        book = OrderBook(0.01)
+        book.apply_snapshot([(100.01, 1.0), (100.0, 2.0)], [(100.05, 1.0)])
+        self.assertAlmostEqual(book.notional_ahead("bid", 100.005), 100.01)
+        self.assertEqual(book.notional_ahead("ask", 100.049), 0.0)
+
+
+class ExportTests(unittest.TestCase):
+    ROWS = [(112300.1, 0.5), (112299.95, 1e-9), (-1.0, 12345.6789012345), (0.0, 0.0)]
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+
+    def _bytes(self, path):
+        with open(path, "rb") as f:
+            return f.read()
+
+    def test_levels_csv_is_byte_identical(self):
+        for rows in (self.ROWS, []):
+            with self.subTest(n=len(rows)):
+                got = os.path.join(self.tmp.name, "got.csv")
+                want = os.path.join(self.tmp.name, "want.csv")
+                write_levels_csv(got, rows)
+                ref_write_levels_csv(want, rows)
+                self.assertEqual(self._bytes(got), self._bytes(want))
+
+    def test_levels_bin_round_trips(self):
+        path = os.path.join(self.tmp.name, "levels.bin")
+        write_levels_bin(path, self.ROWS)
+        a = array("d")
+        a.frombytes(self._bytes(path))
+        self.assertEqual(list(zip(a[::2], a[1::2])), self.ROWS)
+
+    def _run_cli(self, *extra):
+        src = os.path.join(self.tmp.name, "ob.csv")
+        with open(src, "w", newline="") as f:
+            w = csv.writer(f)
+            w.writerow(["time", "symbol", "bids", "asks"])
+            w.writerows(SymbolRowsTests.ROWS)
+        prefix = os.path.join(self.tmp.name, "out", "run")
+        script = os.path.join(os.path.dirname(os.path.abspath(__file__)), "orderbook_maintenance.py")
+        subprocess.run([sys.executable, script, "--file", src, "--symbol", "BTC/USD",
+                        "--until", "1e20", "--out-prefix", prefix, *extra],
+                       check=True, stdout=subprocess.DEVNULL)
+        with open(f"{prefix}_summary.csv", newline="") as f:
+            return prefix, dict(csv.reader(f))
+
+    def test_cli_summary_csv_unchanged(self):
+        prefix, summary = self._run_cli()
+        self.assertNotIn("levels_format", summary)
+        self.assertEqual(summary["top10_bids_csv"], f"{prefix}_top10_bids.csv")
+
+    def test_cli_binary(self):
+        prefix, summary = self._run_cli("--binary")
+        self.assertIn(sys.byteorder, summary["levels_format"])
+        self.assertEqual(summary["top10_bids_bin"], f"{prefix}_top10_bids.bin")
+        a = array("d")
+        a.frombytes(self._bytes(summary["top10_bids_bin"]))
+        self.assertEqual(list(zip(a[::2], a[1::2])), [(99.5, 4.0)])
+
+
+if __name__ == "__main__":
+    unittest.main()